@@ -1,26 +1,90 @@
 import os
+import pickle
+import types
 import yaml
-from typing import Dict, Any
+from collections import OrderedDict
+from typing import Any, Dict, Mapping, Tuple
 from pathlib import Path
 
+# Prefer the libyaml-backed loader; it avoids PyYAML's per-node Python object
+# overhead and is several times faster. Fall back when libyaml isn't available.
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+_CONFIG_DIR = Path(__file__).parent
+
+# Pickled sidecar caches (<module>.yaml.pkl) skip YAML parsing entirely on
+# repeat cold starts. Opt-in because loading pickles from disk is a security
+# trade-off some deployments won't want.
+_SIDECAR_CACHE = os.getenv("AGENT_TOOLKIT_YAML_CACHE") == "1"
+
+def _parse_yaml_file(config_path: Path, st: os.stat_result) -> Dict[str, Any]:
+    """Parse a YAML config file, going through the pickle sidecar when enabled."""
+    if not _SIDECAR_CACHE:
+        with open(config_path, 'r') as f:
+            return yaml.load(f, Loader=SafeLoader)
+
+    pkl_path = config_path.with_suffix(config_path.suffix + ".pkl")
+    try:
+        if pkl_path.stat().st_mtime >= st.st_mtime:
+            return pickle.loads(pkl_path.read_bytes())
+    except (OSError, pickle.UnpicklingError):
+        pass
+
+    with open(config_path, 'r') as f:
+        data = yaml.load(f, Loader=SafeLoader)
+
+    # Write the sidecar atomically so a concurrent reader never sees a torn file.
+    try:
+        tmp_path = pkl_path.with_suffix(".pkl.tmp")
+        tmp_path.write_bytes(pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+        os.replace(tmp_path, pkl_path)
+    except OSError:
+        pass
+
+    return data
+
 class ConfigLoader:
-    _configs: Dict[str, Dict[str, Any]] = {}
-    
+    # LRU cache of parsed configs keyed by module name. Each entry stores the
+    # source file's (mtime, size) so edits are picked up on the next load
+    # without paying a reparse when the file is unchanged.
+    _cache: "OrderedDict[str, Tuple[float, int, Mapping[str, Any]]]" = OrderedDict()
+    _max_entries = 100
+
     @classmethod
-    def load_config(cls, module_name: str) -> Dict[str, Any]:
+    def load_config(cls, module_name: str) -> Mapping[str, Any]:
         """Load configuration for a specific module from its YAML file."""
-        if module_name not in cls._configs:
-            config_path = Path(__file__).parent / f"{module_name}.yaml"
-            if not config_path.exists():
-                raise FileNotFoundError(f"Configuration file not found for module: {module_name}")
-            
-            with open(config_path, 'r') as f:
-                cls._configs[module_name] = yaml.safe_load(f)
-        
-        return cls._configs[module_name]
-    
+        config_path = _CONFIG_DIR / f"{module_name}.yaml"
+        try:
+            st = config_path.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Configuration file not found for module: {module_name}")
+
+        entry = cls._cache.get(module_name)
+        if entry is not None and entry[0] == st.st_mtime and entry[1] == st.st_size:
+            cls._cache.move_to_end(module_name)
+            return entry[2]
+
+        config = types.MappingProxyType(_parse_yaml_file(config_path, st))
+
+        cls._cache[module_name] = (st.st_mtime, st.st_size, config)
+        cls._cache.move_to_end(module_name)
+        if len(cls._cache) > cls._max_entries:
+            cls._cache.popitem(last=False)
+
+        return config
+
     @classmethod
     def get_config(cls, module_name: str, key: str, default: Any = None) -> Any:
         """Get a specific configuration value for a module."""
-        config = cls.load_config(module_name)
-        return config.get(key, default) 
\ No newline at end of file
+        return cls.load_config(module_name).get(key, default)
+
+# Parse every config file once at import and expose read-only views, so hot
+# paths bind values at module load instead of going through the loader per call.
+for _path in sorted(_CONFIG_DIR.glob("*.yaml")):
+    ConfigLoader.load_config(_path.stem)
+
+WEB_SEARCH_CFG = ConfigLoader.load_config("web_search")
+URL_SCRAPER_CFG = ConfigLoader.load_config("url_scraper")
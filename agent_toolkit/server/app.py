@@ -2,43 +2,63 @@ from fastapi import FastAPI, HTTPException, Depends, Request
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from typing import Dict, Any, Callable
-import functools
+from contextlib import asynccontextmanager
+import hmac
 import os
 from dotenv import load_dotenv
 from .rate_limiter import get_rate_limiter
+from ..tools.url_scraper import shutdown_browser
 
 # Load environment variables
 load_dotenv()
 
+# Resolve the expected API key once; the middleware runs on every request and
+# shouldn't pay an env lookup there. compare_digest keeps the check
+# constant-time so the comparison doesn't leak key prefixes.
+_EXPECTED_KEY = (os.getenv("API_KEY") or "").encode()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # The scraper lazily launches a shared Chromium; make sure it goes away
+    # with the server rather than leaking a headless browser process.
+    await shutdown_browser()
+
 # Initialize FastAPI app
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # API key middleware
 @app.middleware("http")
 async def check_api_key(request: Request, call_next):
-    api_key = request.headers.get("X-API-Key")
-    if not api_key or api_key != os.getenv("API_KEY"):
+    # CORS preflights carry no credentials; let them through untouched.
+    if request.method == "OPTIONS":
+        return await call_next(request)
+    provided = (request.headers.get("X-API-Key") or "").encode()
+    if not _EXPECTED_KEY or not hmac.compare_digest(provided, _EXPECTED_KEY):
         return JSONResponse(
             status_code=403,
             content={"detail": "Invalid API key"}
         )
     return await call_next(request)
 
-def rate_limit(tool_name: str, max_requests: int, time_window_seconds: int):
-    """Decorator factory for rate limiting endpoints."""
-    def decorator(func: Callable):
-        rate_limiter = get_rate_limiter(tool_name, max_requests, time_window_seconds)
-        
-        @functools.wraps(func)
-        async def wrapper(*args, **kwargs):
-            if not rate_limiter.can_make_request():
-                raise HTTPException(
-                    status_code=429, 
-                    detail=f"Rate limit exceeded for {tool_name}. Please try again later."
-                )
-            return await func(*args, **kwargs)
-        return wrapper
-    return decorator
+def make_rate_limit_dep(tool_name: str, max_requests: int, time_window_seconds: int, block: bool = False) -> Callable:
+    """Build a FastAPI dependency that rate limits a route.
+
+    With block=True the request waits for a slot instead of raising 429.
+    Using a dependency instead of a decorator keeps the endpoint callable
+    itself unwrapped, so each request skips the extra wrapper frame.
+    """
+    rate_limiter = get_rate_limiter(tool_name, max_requests, time_window_seconds)
+
+    async def rate_limit_dep():
+        if block:
+            await rate_limiter.wait_for_slot_async()
+        elif not rate_limiter.can_make_request():
+            raise HTTPException(
+                status_code=429,
+                detail=f"Rate limit exceeded for {tool_name}. Please try again later."
+            )
+    return rate_limit_dep
 
 class SearchQuery(BaseModel):
     query: str 
\ No newline at end of file
@@ -1,36 +1,57 @@
-from datetime import datetime
-from collections import deque
+import asyncio
+import functools
+from array import array
+from math import inf
 import threading
 import time
-from typing import Dict
 
 class RateLimiter:
     def __init__(self, max_requests: int, time_window_seconds: int):
         self.max_requests = max_requests
         self.time_window_seconds = time_window_seconds
-        self.requests = deque()
+        # Ring buffer of monotonic admission times, one slot per allowed
+        # request. head points at the oldest admission; a new request is
+        # admissible exactly when that slot has aged out of the window.
+        self.times = array('d', [-inf] * max_requests)
+        self.head = 0
         self.lock = threading.Lock()
 
     def can_make_request(self) -> bool:
-        now = datetime.now()
+        now = time.monotonic()
+        # Optimistic unlocked read: each attribute load is atomic under the
+        # GIL, and slot times only ever increase, so a stale read can at worst
+        # reject a request that just became admissible. The contended path
+        # when the limiter is saturated therefore never touches the lock.
+        if now - self.times[self.head] < self.time_window_seconds:
+            return False
         with self.lock:
-            while self.requests and (now - self.requests[0]).total_seconds() > self.time_window_seconds:
-                self.requests.popleft()
-            
-            if len(self.requests) < self.max_requests:
-                self.requests.append(now)
+            if now - self.times[self.head] >= self.time_window_seconds:
+                self.times[self.head] = now
+                self.head = (self.head + 1) % self.max_requests
                 return True
             return False
 
+    def _seconds_until_slot(self) -> float:
+        """Time until the oldest admission ages out of the window."""
+        return self.time_window_seconds - (time.monotonic() - self.times[self.head])
+
     def wait_for_slot(self):
         while not self.can_make_request():
-            time.sleep(1)
+            time.sleep(max(self._seconds_until_slot(), 0))
 
-# Global registry of rate limiters
-_rate_limiters: Dict[str, RateLimiter] = {}
+    async def wait_for_slot_async(self):
+        """Wait for an admission slot without blocking the event loop.
+
+        Sleeps exactly until the oldest admission expires rather than
+        polling; loops in case another task claims the freed slot first.
+        """
+        while not self.can_make_request():
+            await asyncio.sleep(max(self._seconds_until_slot(), 0))
 
+# lru_cache doubles as a thread-safe registry: the unlocked check-then-set it
+# replaces could race under FastAPI's threadpool and create two limiters for
+# one tool, silently doubling the quota.
+@functools.lru_cache(maxsize=None)
 def get_rate_limiter(tool_name: str, max_requests: int, time_window_seconds: int) -> RateLimiter:
     """Get or create a rate limiter for a specific tool."""
-    if tool_name not in _rate_limiters:
-        _rate_limiters[tool_name] = RateLimiter(max_requests, time_window_seconds)
-    return _rate_limiters[tool_name] 
\ No newline at end of file
+    return RateLimiter(max_requests, time_window_seconds)
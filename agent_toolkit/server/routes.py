@@ -1,19 +1,18 @@
-from fastapi import HTTPException
-from .app import app, SearchQuery, rate_limit
+from fastapi import Depends, HTTPException
+from .app import app, SearchQuery, make_rate_limit_dep
 from ..tools.web_search import search_web, WebSearchResponse
 from ..tools.url_scraper import scrape_url, ScraperResponse
-from ..config.loader import ConfigLoader
+from ..config.loader import WEB_SEARCH_CFG, URL_SCRAPER_CFG
 from pydantic import BaseModel
 
-# Load configurations
-web_search_config = ConfigLoader.load_config("web_search")
-url_scraper_config = ConfigLoader.load_config("url_scraper")
-
-@app.post("/search_web", response_model=WebSearchResponse)
-@rate_limit(
-    "web_search",
-    max_requests=web_search_config["rate_limit"]["max_requests"],
-    time_window_seconds=web_search_config["rate_limit"]["time_window_seconds"]
+@app.post(
+    "/search_web",
+    response_model=WebSearchResponse,
+    dependencies=[Depends(make_rate_limit_dep(
+        "web_search",
+        max_requests=WEB_SEARCH_CFG["rate_limit"]["max_requests"],
+        time_window_seconds=WEB_SEARCH_CFG["rate_limit"]["time_window_seconds"]
+    ))]
 )
 async def handle_web_search(query: SearchQuery):
     """Handle web search requests."""
@@ -30,11 +29,14 @@ class URLScraperQuery(BaseModel):
     url: str
     render_js: bool = False
 
-@app.post("/scrape_url", response_model=ScraperResponse)
-@rate_limit(
-    "url_scraper",
-    max_requests=url_scraper_config["rate_limit"]["max_requests"],
-    time_window_seconds=url_scraper_config["rate_limit"]["time_window_seconds"]
+@app.post(
+    "/scrape_url",
+    response_model=ScraperResponse,
+    dependencies=[Depends(make_rate_limit_dep(
+        "url_scraper",
+        max_requests=URL_SCRAPER_CFG["rate_limit"]["max_requests"],
+        time_window_seconds=URL_SCRAPER_CFG["rate_limit"]["time_window_seconds"]
+    ))]
 )
 async def handle_url_scrape(query: URLScraperQuery):
     """Handle URL scraping requests."""
@@ -1,11 +1,53 @@
 import requests
 import urllib3
 import asyncio
+import hashlib
+import logging
+import re
+import threading
+from collections import OrderedDict
 from typing import Dict, Any, Optional
 from pydantic import BaseModel
 from markdownify import markdownify
 from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
-from ..config.loader import ConfigLoader
+from ..config.loader import URL_SCRAPER_CFG as _CFG
+from ..utils.urls import clean_url
+
+logger = logging.getLogger(__name__)
+
+_SCRAPER_CFG = _CFG["scraper"]
+
+# Shared connection pools so repeat scrapes reuse TCP/TLS connections instead
+# of paying a fresh handshake per request.
+_SESSION = requests.Session()
+_SESSION.headers["User-Agent"] = _SCRAPER_CFG["user_agent"]
+_FALLBACK_HTTP = urllib3.PoolManager(headers={"User-Agent": _SCRAPER_CFG["user_agent"]})
+
+# markdownify builds a full BeautifulSoup tree per page, which dominates CPU
+# for large documents. Cache converted output keyed by content hash so repeat
+# scrapes of an unchanged page skip the parse; the lock is needed because the
+# non-JS path runs in worker threads.
+_MULTI_NEWLINE_RE = re.compile(r"\n{3,}")
+_MD_CACHE: "OrderedDict[bytes, str]" = OrderedDict()
+_MD_CACHE_MAX = 256
+_md_cache_lock = threading.Lock()
+
+def _to_markdown(html: str) -> str:
+    """Convert HTML to trimmed markdown, memoized by content hash."""
+    digest = hashlib.blake2b(html.encode(), digest_size=16).digest()
+    with _md_cache_lock:
+        cached = _MD_CACHE.get(digest)
+        if cached is not None:
+            _MD_CACHE.move_to_end(digest)
+            return cached
+
+    content = _MULTI_NEWLINE_RE.sub("\n\n", markdownify(html).strip())
+
+    with _md_cache_lock:
+        _MD_CACHE[digest] = content
+        if len(_MD_CACHE) > _MD_CACHE_MAX:
+            _MD_CACHE.popitem(last=False)
+    return content
 
 class ScraperResponse(BaseModel):
     """Response model for URL scraping."""
@@ -13,53 +55,70 @@ class ScraperResponse(BaseModel):
     content: Optional[str] = None
     error: Optional[str] = None
 
-def clean_url(url: str) -> str:
-    """Clean and encode a URL."""
-    url = url.strip()
-    if " " in url:
-        # If it's a GitHub URL with spaces, try to fix it
-        if "github.com" in url:
-            parts = url.split()
-            if len(parts) >= 2:
-                url = f"{parts[0]}/{parts[1]}"
-        else:
-            # For other URLs, just encode spaces
-            url = url.replace(" ", "%20")
-    return url
+# Chromium cold start costs hundreds of ms, so the browser is launched once
+# and shared; each scrape only creates (and closes) its own context. The
+# semaphore bounds how many pages render at a time.
+_playwright = None
+_browser = None
+_browser_lock = asyncio.Lock()
+_render_semaphore = asyncio.Semaphore(4)
+
+async def _get_browser():
+    """Return the shared Chromium instance, launching it on first use."""
+    global _playwright, _browser
+    if _browser is None or not _browser.is_connected():
+        async with _browser_lock:
+            if _browser is None or not _browser.is_connected():
+                if _playwright is None:
+                    _playwright = await async_playwright().start()
+                _browser = await _playwright.chromium.launch(headless=True)
+    return _browser
+
+async def shutdown_browser():
+    """Close the shared browser and Playwright driver on app shutdown."""
+    global _playwright, _browser
+    if _browser is not None:
+        await _browser.close()
+        _browser = None
+    if _playwright is not None:
+        await _playwright.stop()
+        _playwright = None
 
 async def scrape_with_playwright(url: str, config: Dict[str, Any]) -> ScraperResponse:
     """Scrape content using Playwright with JavaScript rendering."""
     try:
         url = clean_url(url)
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
+        async with _render_semaphore:
+            browser = await _get_browser()
             context = await browser.new_context(
                 user_agent=config["user_agent"],
                 viewport={'width': 1920, 'height': 1080}
             )
-            
-            page = await context.new_page()
-            
-            try:
-                await page.goto(url, wait_until="load", timeout=config["timeout"] * 1000)
-            except PlaywrightTimeout:
-                await page.goto(url, wait_until="domcontentloaded", timeout=config["timeout"] * 1000)
-            
+
             try:
-                await page.wait_for_load_state("networkidle", timeout=5000)
-            except PlaywrightTimeout:
-                pass
-            
-            # Scroll to trigger lazy loading
-            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            await asyncio.sleep(2)  # Wait for 2 seconds
-            
-            content = await page.content()
-            await browser.close()
-            
+                page = await context.new_page()
+
+                try:
+                    await page.goto(url, wait_until="load", timeout=config["timeout"] * 1000)
+                except PlaywrightTimeout:
+                    await page.goto(url, wait_until="domcontentloaded", timeout=config["timeout"] * 1000)
+
+                try:
+                    await page.wait_for_load_state("networkidle", timeout=5000)
+                except PlaywrightTimeout:
+                    pass
+
+                # Scroll to trigger lazy loading
+                await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+                await asyncio.sleep(2)  # Wait for 2 seconds
+
+                content = await page.content()
+            finally:
+                await context.close()
+
             return ScraperResponse(
                 status="success",
-                content=markdownify(content).strip().replace("\n\n\n", "\n\n")
+                content=_to_markdown(content)
             )
     except Exception as e:
         return ScraperResponse(
@@ -71,12 +130,10 @@ def scrape_with_requests(url: str, config: Dict[str, Any]) -> ScraperResponse:
     """Scrape content using requests."""
     try:
         url = clean_url(url)
-        headers = {"User-Agent": config["user_agent"]}
-        response = requests.get(url, headers=headers, timeout=config["timeout"])
+        response = _SESSION.get(url, timeout=config["timeout"])
         response.raise_for_status()
 
-        content = markdownify(response.text).strip()
-        content = content.replace("\n\n\n", "\n\n")
+        content = _to_markdown(response.text)
 
         return ScraperResponse(
             status="success",
@@ -85,17 +142,15 @@ def scrape_with_requests(url: str, config: Dict[str, Any]) -> ScraperResponse:
     except requests.exceptions.RequestException as e:
         # Fallback to urllib3 if requests fails
         try:
-            http = urllib3.PoolManager(
-                headers=headers,
+            response = _FALLBACK_HTTP.request(
+                "GET", url,
                 timeout=urllib3.Timeout(connect=config["timeout"], read=config["timeout"])
             )
-            response = http.request("GET", url)
             
             if response.status >= 400:
                 raise urllib3.exceptions.HTTPError(f"HTTP {response.status}")
 
-            content = markdownify(response.data.decode('utf-8')).strip()
-            content = content.replace("\n\n\n", "\n\n")
+            content = _to_markdown(response.data.decode('utf-8'))
 
             return ScraperResponse(
                 status="success",
@@ -109,12 +164,10 @@ def scrape_with_requests(url: str, config: Dict[str, Any]) -> ScraperResponse:
 
 async def scrape_url(url: str, render_js: bool = False) -> ScraperResponse:
     """Scrape content from a URL and convert it to markdown."""
-    config = ConfigLoader.load_config("url_scraper")
-    scraper_config = config["scraper"]
-    print(f"-" * 20)
-    print(f"## Scraping URL with render_js={render_js}\n```\n{url}\n```")
-    print(f"-" * 20)
+    logger.info("Scraping %s (render_js=%s)", url, render_js)
     if render_js:
-        return await scrape_with_playwright(url, scraper_config)
+        return await scrape_with_playwright(url, _SCRAPER_CFG)
     else:
-        return scrape_with_requests(url, scraper_config) 
\ No newline at end of file
+        # scrape_with_requests blocks on network I/O and CPU-bound markdown
+        # conversion; run it in a worker thread so the event loop stays free.
+        return await asyncio.to_thread(scrape_with_requests, url, _SCRAPER_CFG) 
\ No newline at end of file
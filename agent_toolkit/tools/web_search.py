@@ -1,16 +1,61 @@
-import json
+import asyncio
 import logging
+import random
 import re
+import time
 import requests
 from typing import Dict, Any, List, Optional
 from pydantic import BaseModel
 from google import genai
 from google.genai import types
 import os
-from ..config.loader import ConfigLoader
+from ..config.loader import WEB_SEARCH_CFG as _CFG
+from ..utils.urls import clean_url
 
 logger = logging.getLogger(__name__)
 
+_GEMINI_CFG = _CFG["api"]["gemini"]
+_SEARCH_CFG = _CFG["search"]
+
+# Shared connection pool for reference enrichment; redirect chasing hits the
+# same hosts repeatedly, so keep-alive saves a TLS handshake per reference.
+_HTTP = requests.Session()
+
+# Only the first 8 KiB is ever inspected (title/href live in the head), so ask
+# the server for just that range; servers that ignore Range still get
+# truncated by the bounded read below.
+_RANGE_HEADERS = {"Range": "bytes=0-8191"}
+
+# Precompiled as bytes patterns so the fetched 8 KiB chunk is scanned without
+# first decoding it; only the matched title/href gets decoded.
+_TITLE_RE = re.compile(rb'<title[^>]*>([^<]+)</title>', re.IGNORECASE)
+_HREF_RE = re.compile(rb'href="([^"]+)"')
+
+# Bounds how many redirect chases run at once during reference enrichment.
+_redirect_semaphore = asyncio.Semaphore(8)
+
+# The model name and generation config never change between requests, so build
+# them once; the client is created lazily so the API key can come from an
+# environment loaded after import.
+_GEMINI_MODEL = _GEMINI_CFG["model"]
+_GEMINI_GEN_CONFIG = types.GenerateContentConfig(
+    tools=[types.Tool(google_search=types.GoogleSearch())]
+)
+_gemini_client = None
+
+def _get_gemini_client():
+    """Get or create the shared Gemini client, or None if no key is configured."""
+    global _gemini_client
+    if _gemini_client is None:
+        gemini_key = _GEMINI_CFG["key"]
+        if gemini_key.startswith("${") and gemini_key.endswith("}"):
+            # Handle environment variable interpolation
+            gemini_key = os.getenv(gemini_key[2:-1])
+        if not gemini_key:
+            return None
+        _gemini_client = genai.Client(api_key=gemini_key)
+    return _gemini_client
+
 class WebSearchReference(BaseModel):
     """Model for a single web search reference."""
     content: str
@@ -24,50 +69,46 @@ class WebSearchResponse(BaseModel):
     data: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
 
-def extract_title_from_html(html_content: str) -> str | None:
-    """Extract title from HTML content using regex."""
-    title_match = re.search(r'<title[^>]*>([^<]+)</title>', html_content, re.IGNORECASE)
-    return title_match.group(1).strip() if title_match else None
+def extract_title_from_html(html_content: bytes) -> str | None:
+    """Extract title from raw HTML content using regex."""
+    title_match = _TITLE_RE.search(html_content)
+    return title_match.group(1).decode('utf-8', errors='ignore').strip() if title_match else None
+
+def follow_redirect(url: str, fallback_title: str | None = None, timeout: int = 5) -> tuple[str, str | None]:
+    """Follow a URL redirect and return the final URL and page title.
 
-def follow_redirect(url: str, timeout: int = 5) -> tuple[str, str | None]:
-    """Follow a URL redirect and return the final URL and page title."""
+    When the caller already has a usable title, pass it as fallback_title:
+    the redirect chain is then resolved with a body-less HEAD and the
+    content fetch is skipped entirely unless the target still needs
+    unwrapping from a Google grounding URL.
+    """
     try:
-        # Clean and encode the URL
-        url = url.strip()
-        if " " in url:
-            # If it's a GitHub URL with spaces, try to fix it
-            if "github.com" in url:
-                parts = url.split()
-                if len(parts) >= 2:
-                    url = f"{parts[0]}/{parts[1]}"
-            else:
-                # For other URLs, just encode spaces
-                url = url.replace(" ", "%20")
-        
-        # First try with HEAD request to get redirects without downloading content
-        response = requests.head(url, allow_redirects=True, timeout=timeout)
+        url = clean_url(url)
+
+        if fallback_title:
+            response = _HTTP.head(url, allow_redirects=True, timeout=timeout)
+            final_url = response.url
+            if "vertexaisearch.cloud.google.com" not in final_url:
+                return final_url, fallback_title
+
+        # A single streaming GET resolves the redirect chain and yields the
+        # first chunk of content, where HEAD-then-GET cost two round-trips.
+        response = _HTTP.get(url, allow_redirects=True, stream=True, timeout=timeout,
+                             headers=_RANGE_HEADERS)
         final_url = response.url
-        
-        # If it's still a Google redirect URL, try to get the actual content
+        content = response.raw.read(8192, decode_content=True)
+        response.close()
+
+        # If it's still a Google redirect URL, extract and follow the actual target
         if "vertexaisearch.cloud.google.com" in final_url:
-            response = requests.get(final_url, stream=True, timeout=timeout)
-            content = next(response.iter_content(8192)).decode('utf-8', errors='ignore')
-            response.close()
-            
-            # Try to extract the actual URL from the response
-            url_match = re.search(r'href="([^"]+)"', content)
+            url_match = _HREF_RE.search(content)
             if url_match:
-                final_url = url_match.group(1)
-                # Follow the actual URL
-                response = requests.get(final_url, stream=True, timeout=timeout)
-                content = next(response.iter_content(8192)).decode('utf-8', errors='ignore')
+                final_url = url_match.group(1).decode('utf-8', errors='ignore')
+                response = _HTTP.get(final_url, stream=True, timeout=timeout,
+                                     headers=_RANGE_HEADERS)
+                content = response.raw.read(8192, decode_content=True)
                 response.close()
-        else:
-            # For non-Google URLs, just get the content
-            response = requests.get(final_url, stream=True, timeout=timeout)
-            content = next(response.iter_content(8192)).decode('utf-8', errors='ignore')
-            response.close()
-        
+
         title = extract_title_from_html(content)
         if title and any(x in title for x in ["Attention Required! | Cloudflare", "Just a moment...", "Security check"]):
             return final_url, None
@@ -77,12 +118,9 @@ def follow_redirect(url: str, timeout: int = 5) -> tuple[str, str | None]:
         logger.error(f"Error following redirect: {e}")
         return url, None
 
-def extract_references(response, max_references: int = 10) -> List[WebSearchReference]:
-    """Extract detailed references from Gemini response."""
+async def extract_references(raw_response: Dict[str, Any], max_references: int = 10) -> List[WebSearchReference]:
+    """Extract detailed references from an already-dumped Gemini response."""
     try:
-        raw_response = json.loads(response.model_dump_json())
-        logger.debug(f"Raw response: {json.dumps(raw_response, indent=2)}")
-        
         candidates = raw_response.get("candidates", [])
         if not candidates:
             logger.warning("No candidates found in response")
@@ -99,58 +137,72 @@ def extract_references(response, max_references: int = 10) -> List[WebSearchRefe
         
         logger.debug(f"Found {len(grounding_supports)} supports and {len(grounding_chunks)} chunks")
         
-        references = []
-        
+        # First pass: run the cheap structural checks and collect the
+        # references to enrich, so no HTTP work is spent on skipped entries.
+        pending = []
         for support in grounding_supports:
-            if len(references) >= max_references:
+            if len(pending) >= max_references:
                 break
-                
+
             # Skip if no chunk indices
             chunk_indices = support.get("grounding_chunk_indices") or []
             if not chunk_indices:
                 logger.debug("Support has no chunk indices, skipping")
                 continue
-                
+
+            # Get text content safely
+            text = support.get("segment", {}).get("text", "")
+            if not text:
+                logger.warning("Support has no text content, skipping")
+                continue
+
+            # Get confidence score safely
+            confidence_scores = support.get("confidence_scores") or []
+            confidence = confidence_scores[0] if confidence_scores else None
+
             for chunk_idx in chunk_indices:
                 # Skip if chunk index is out of range
                 if chunk_idx >= len(grounding_chunks):
                     logger.warning(f"Chunk index {chunk_idx} out of range, skipping")
                     continue
-                    
+
                 chunk = grounding_chunks[chunk_idx]
                 if "web" not in chunk:
                     logger.debug(f"Chunk {chunk_idx} has no web data, skipping")
                     continue
-                    
-                try:
-                    url = chunk["web"]["uri"]
-                    final_url, actual_title = follow_redirect(url)
-                    
-                    # Get text content safely
-                    text = support.get("segment", {}).get("text", "")
-                    if not text:
-                        logger.warning("Support has no text content, skipping")
-                        continue
-                    
-                    # Get confidence score safely
-                    confidence_scores = support.get("confidence_scores") or []
-                    confidence = confidence_scores[0] if confidence_scores else None
-                    
-                    reference = WebSearchReference(
-                        content=text,
-                        url=final_url,
-                        title=actual_title or chunk["web"].get("title", ""),
-                        confidence=confidence
-                    )
-                    references.append(reference)
-                    logger.debug(f"Added reference: {reference.model_dump()}")
-                    
-                    if len(references) >= max_references:
-                        break
-                except Exception as e:
-                    logger.error(f"Error processing chunk {chunk_idx}: {e}")
-                    continue
-        
+
+                pending.append((text, confidence, chunk["web"]))
+                if len(pending) >= max_references:
+                    break
+
+        # Second pass: chase every redirect concurrently in worker threads,
+        # so N references cost one round-trip of latency instead of N.
+        async def resolve(web_chunk):
+            async with _redirect_semaphore:
+                return await asyncio.to_thread(
+                    follow_redirect, web_chunk["uri"], web_chunk.get("title")
+                )
+
+        results = await asyncio.gather(
+            *(resolve(web_chunk) for _, _, web_chunk in pending),
+            return_exceptions=True
+        )
+
+        references = []
+        for (text, confidence, web_chunk), result in zip(pending, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Error resolving reference {web_chunk.get('uri')}: {result}")
+                continue
+            final_url, actual_title = result
+            reference = WebSearchReference(
+                content=text,
+                url=final_url,
+                title=actual_title or web_chunk.get("title", ""),
+                confidence=confidence
+            )
+            references.append(reference)
+            logger.debug(f"Added reference: {reference.model_dump()}")
+
         logger.info(f"Successfully extracted {len(references)} references")
         return references
     except Exception as e:
@@ -165,33 +217,29 @@ async def search_web(query: str) -> WebSearchResponse:
             error="No query provided"
         )
     
-    # Load configuration
-    config = ConfigLoader.load_config("web_search")
-    gemini_key = config["api"]["gemini"]["key"]
-    if gemini_key.startswith("${") and gemini_key.endswith("}"):
-        # Handle environment variable interpolation
-        env_var = gemini_key[2:-1]
-        gemini_key = os.getenv(env_var)
-    
-    if not gemini_key:
+    client = _get_gemini_client()
+    if client is None:
         return WebSearchResponse(
             status="error",
             error="Gemini API key not configured"
         )
-    
-    max_retries = 3
+
+    max_retries = _SEARCH_CFG.get("max_retries", 3)
+    deadline = time.monotonic() + _SEARCH_CFG.get("deadline_s", 20)
     for attempt in range(max_retries):
         try:
-            client = genai.Client(api_key=gemini_key)
-            response = client.models.generate_content(
-                model=config["api"]["gemini"]["model"],
+            # The SDK call is blocking; keep it off the event loop.
+            response = await asyncio.to_thread(
+                client.models.generate_content,
+                model=_GEMINI_MODEL,
                 contents=query,
-                config=types.GenerateContentConfig(
-                    tools=[types.Tool(google_search=types.GoogleSearch())]
-                )
+                config=_GEMINI_GEN_CONFIG
             )
-            
-            raw_response = json.loads(response.model_dump_json())
+
+            # model_dump gives the dict directly, skipping the JSON
+            # serialize/parse round-trip of model_dump_json + json.loads.
+            raw_response = response.model_dump()
+            logger.debug("Raw response: %s", raw_response)
             candidates = raw_response.get("candidates", [])
             if not candidates:
                 logger.warning("No candidates in response")
@@ -208,7 +256,7 @@ async def search_web(query: str) -> WebSearchResponse:
                     error="No grounding metadata in response"
                 )
             
-            references = extract_references(response, config["search"]["max_references"])
+            references = await extract_references(raw_response, _SEARCH_CFG["max_references"])
             logger.info(f"Extracted {len(references)} references")
             
             return WebSearchResponse(
@@ -222,7 +270,12 @@ async def search_web(query: str) -> WebSearchResponse:
             )
         except Exception as e:
             logger.error(f"Search attempt {attempt + 1} failed: {e}", exc_info=True)
-            if attempt == max_retries - 1:
+            remaining = deadline - time.monotonic()
+            if attempt < max_retries - 1 and remaining > 0:
+                # Exponential backoff with jitter so failed attempts don't
+                # hammer the upstream in lockstep; never sleep past the deadline.
+                await asyncio.sleep(min(2 ** attempt * 0.25 + random.random() * 0.25, remaining))
+            else:
                 return WebSearchResponse(
                     status="error",
                     error=str(e)
@@ -0,0 +1,16 @@
+from urllib.parse import quote
+
+# Reserved URL characters to leave untouched; '%' is included so URLs that
+# arrive already percent-encoded aren't encoded twice.
+_SAFE_CHARS = "%:/?#[]@!$&'()*+,;="
+
+def clean_url(url: str) -> str:
+    """Clean and encode a URL."""
+    url = url.strip()
+    if " " in url and "github.com" in url:
+        # If it's a GitHub URL with spaces, try to fix it
+        parts = url.split()
+        if len(parts) >= 2:
+            url = f"{parts[0]}/{parts[1]}"
+    # quote is C-implemented and handles every illegal character, not just spaces
+    return quote(url, safe=_SAFE_CHARS)